@@ -5,172 +5,348 @@ Enhanced Gradio app with direct image processing capabilities
 import gradio as gr
 import sys
 import os
+import concurrent.futures
+import functools
+import importlib
+import io
+import hashlib
+import json
+import mmap
+import re
 from pathlib import Path
 
+# Keep each Tesseract invocation single-threaded: we parallelize across
+# images ourselves, and N single-threaded OCR runs beat OpenMP contention.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
 # Add the project root to the Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-# Import enhanced OCR and MCP server functions directly
-try:
-    from enhanced_ocr_processor import get_ocr_status, extract_text_with_ocr
-    from src.server.server import list_docs, read_doc, search_docs, DOCS_ROOT
-    OCR_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import enhanced functionality: {e}")
-    OCR_AVAILABLE = False
+# The OCR and MCP server modules are heavyweight (they can pull in
+# Tesseract wrappers, torch/transformers and the Anthropic HTTP stack),
+# so they are imported lazily on first use instead of at startup.
+_OCR_MOD = None
+_SERVER_MOD = None
+
+
+def _ensure_ocr():
+    """Import enhanced_ocr_processor on first use, caching the module."""
+    global _OCR_MOD
+    if _OCR_MOD is None:
+        _OCR_MOD = importlib.import_module("enhanced_ocr_processor")
+    return _OCR_MOD
+
+
+def _ensure_server():
+    """Import the MCP server module (doc listing/reading) on first use."""
+    global _SERVER_MOD
+    if _SERVER_MOD is None:
+        _SERVER_MOD = importlib.import_module("src.server.server")
+    return _SERVER_MOD
+
+# OCR results are cached on disk keyed by image content hash, so repeat
+# queries skip the multi-second OCR run entirely. Renaming a file or
+# editing its pixels changes the hash and invalidates the entry.
+OCR_CACHE_DIR = Path(__file__).parent / ".cache" / "ocr"
+
+# One pass over the OCR output: capture the confidence figure from the
+# header line and everything after it as the extracted text.
+_OCR_RE = re.compile(r"Confidence:\s*([\d.]+)%.*?---\n(.*)", re.S)
+
+# Separators stripped when matching image names against the query;
+# str.translate removes them in a single C-level pass
+_STRIP_TABLE = str.maketrans("", "", " _-")
+
+# Image file extensions: one O(1) set lookup instead of a suffix
+# comparison per extension
+_IMG_EXTS = frozenset({".png", ".jpg", ".jpeg", ".tiff", ".bmp", ".gif"})
+
+# Image-related keywords as one alternation: a single scan of the query
+# instead of one substring pass per keyword
+_IMG_KEYWORDS_RE = re.compile(
+    r"\b(?:image|picture|photo|diagram|chart|figure|visual|describe|show|png|jpe?g)\b",
+    re.I,
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _image_docs_cached(docs_mtime: float) -> list:
+    """Filesystem walk + image filter, re-run only when the docs tree changes."""
+    docs = _ensure_server().list_docs()
+    return [
+        doc for doc in docs
+        if doc.startswith('images/') and os.path.splitext(doc)[1].lower() in _IMG_EXTS
+    ]
+
+
+def _list_image_docs() -> list:
+    """List image docs, cached on the mtime of the images folder."""
+    server = _ensure_server()
+    images_dir = server.DOCS_ROOT / "images"
+    probe = images_dir if images_dir.exists() else server.DOCS_ROOT
+    return _image_docs_cached(os.path.getmtime(probe))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_name_index(image_docs: tuple) -> dict:
+    """Map normalized image file names to doc paths, built once per doc listing."""
+    return {Path(d).name.lower().translate(_STRIP_TABLE): d for d in image_docs}
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_ocr_content(doc: str, digest: str) -> str:
+    """Look up OCR output for (doc, content hash), falling back to a real read."""
+    cache_file = OCR_CACHE_DIR / f"{digest}.json"
+    try:
+        return json.loads(cache_file.read_text(encoding="utf-8"))["content"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    content = _ensure_server().read_doc(doc)
+    try:
+        OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps({"content": content}), encoding="utf-8")
+    except OSError:
+        pass  # Cache is best-effort; the result is still returned
+    return content
+
+
+def _hash_file(path: Path) -> str:
+    """Content hash of a file, fed to blake2b via mmap to avoid copying."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        except (ValueError, OSError):
+            # Empty file or no mmap support - fall back to a chunked read
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def cached_read_doc(doc: str) -> str:
+    """read_doc with an in-memory + on-disk cache keyed by file content."""
+    server = _ensure_server()
+    try:
+        digest = _hash_file(server.DOCS_ROOT / doc)
+    except OSError:
+        return server.read_doc(doc)
+    return _cached_ocr_content(doc, digest)
+
+
+def _parse_ocr_batch(contents: list, preview_len: int = None) -> list:
+    """
+    Parse a batch of OCR outputs in one pass.
+
+    Returns one entry per input: a (confidence, extracted_text) tuple, or
+    the original exception for failed reads. When preview_len is given only
+    that many characters of text are materialized (with an ellipsis when
+    truncated), so the multi-KB tail of a long OCR result is never copied.
+    """
+    parsed = []
+    for content in contents:
+        if isinstance(content, Exception):
+            parsed.append(content)
+            continue
+        m = _OCR_RE.search(content)
+        if m is None:
+            text = content.strip()
+            if preview_len is not None and len(text) > preview_len:
+                text = text[:preview_len] + "..."
+            parsed.append((None, text))
+            continue
+        start, end = m.span(2)
+        if preview_len is not None and end - start > preview_len:
+            # Slice the preview window straight out of the source string
+            text = content[start:start + preview_len].strip() + "..."
+        else:
+            text = m.group(2).strip()
+        parsed.append((m.group(1), text))
+    return parsed
+
+
+def _safe_read_doc(doc: str):
+    """Run cached_read_doc in a worker thread, returning the exception instead of raising."""
+    try:
+        return cached_read_doc(doc)
+    except Exception as e:
+        return e
+
 
 def process_image_question_directly(query: str) -> str:
     """Process questions about images directly without MCP client"""
     try:
-        query_lower = query.lower()
-        
         # Check if this is an image-related question
-        image_keywords = ["image", "picture", "photo", "diagram", "chart", "figure", "visual", "describe", "show", "png", "jpg", "jpeg"]
-        is_image_question = any(keyword in query_lower for keyword in image_keywords)
-        
-        if not is_image_question:
+        if _IMG_KEYWORDS_RE.search(query) is None:
             return None  # Let normal processing handle it
-        
-        if not OCR_AVAILABLE:
+
+        query_lower = query.lower()
+
+        try:
+            ocr = _ensure_ocr()
+            server = _ensure_server()
+        except ImportError as e:
+            print(f"Warning: Could not import enhanced functionality: {e}")
             return "❌ OCR functionality is not available. Please install the required dependencies."
-        
+
         # Get OCR status
-        ocr_status = get_ocr_status()
+        ocr_status = ocr.get_ocr_status()
         if not ocr_status.get("available", False):
             return f"❌ OCR is not available: {ocr_status.get('error', 'Unknown error')}"
         
-        # List available documents
-        docs = list_docs()
-        image_docs = [doc for doc in docs if doc.startswith('images/') and any(doc.endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp', '.gif'])]
-        
+        # List available image documents (cached until the docs tree changes)
+        image_docs = _list_image_docs()
+
         if not image_docs:
             return "❌ No image files found in the documentation."
         
-        # If specific image mentioned, try to find it
+        # If specific image mentioned, try to find it via the prebuilt
+        # name index - the query is normalized once, not once per doc
+        normalized_query = query_lower.translate(_STRIP_TABLE)
         specific_image = None
-        for doc in image_docs:
-            filename = Path(doc).name.lower()
-            if filename.replace(' ', '').replace('_', '').replace('-', '') in query_lower.replace(' ', '').replace('_', '').replace('-', ''):
+        for norm_name, doc in _build_name_index(tuple(image_docs)).items():
+            if norm_name in normalized_query:
                 specific_image = doc
                 break
         
-        response_parts = []
-        response_parts.append(f"🖼️ **Image Analysis Results**")
-        response_parts.append(f"📊 OCR Status: {ocr_status.get('active_backend', 'Unknown')} backend available")
+        # Accumulate the reply in one growing buffer instead of a list of
+        # fragments joined at the end
+        buf = io.StringIO()
+
+        def emit(part: str):
+            if buf.tell():
+                buf.write("\\n")
+            buf.write(part)
+
+        emit(f"🖼️ **Image Analysis Results**")
+        emit(f"📊 OCR Status: {ocr_status.get('active_backend', 'Unknown')} backend available")
         
         if specific_image:
             # Process specific image
-            response_parts.append(f"\\n🎯 **Analyzing specific image: {specific_image}**")
+            emit(f"\\n🎯 **Analyzing specific image: {specific_image}**")
             try:
-                content = read_doc(specific_image)
+                content = cached_read_doc(specific_image)
                 if "OCR Failed" in content:
-                    response_parts.append(f"❌ Failed to extract text from {specific_image}")
+                    emit(f"❌ Failed to extract text from {specific_image}")
                 else:
-                    # Extract OCR information
-                    if "Confidence:" in content:
-                        confidence_start = content.find("Confidence: ") + 12
-                        confidence_end = content.find("%", confidence_start)
-                        confidence = content[confidence_start:confidence_end]
-                        response_parts.append(f"🎯 OCR Confidence: {confidence}%")
-                    
-                    # Extract the actual text
-                    if "---\\n" in content:
-                        text_start = content.find("---\\n") + 4
-                        extracted_text = content[text_start:].strip()
-                    else:
-                        extracted_text = content.strip()
-                    
-                    response_parts.append(f"\\n📄 **Extracted Text:**")
-                    response_parts.append(extracted_text)
+                    # Extract OCR confidence and the actual text in one scan
+                    m = _OCR_RE.search(content)
+                    if m:
+                        emit(f"🎯 OCR Confidence: {m.group(1)}%")
+                    extracted_text = (m.group(2) if m else content).strip()
+
+                    emit(f"\\n📄 **Extracted Text:**")
+                    emit(extracted_text)
                     
                     # Provide description based on content
                     if extracted_text:
-                        response_parts.append(f"\\n📝 **Description:**")
-                        response_parts.append(f"This image contains text related to: {extracted_text[:200]}...")
+                        emit(f"\\n📝 **Description:**")
+                        emit(f"This image contains text related to: {extracted_text[:200]}...")
                         
                         # Identify content type
                         content_lower = extracted_text.lower()
                         if any(word in content_lower for word in ["transformer", "embedding", "model"]):
-                            response_parts.append("🤖 This appears to be a technical diagram related to AI/ML models.")
+                            emit("🤖 This appears to be a technical diagram related to AI/ML models.")
                         elif any(word in content_lower for word in ["architecture", "system", "component"]):
-                            response_parts.append("🏗️ This appears to be an architectural or system diagram.")
+                            emit("🏗️ This appears to be an architectural or system diagram.")
                         elif any(word in content_lower for word in ["flow", "process", "step"]):
-                            response_parts.append("🔄 This appears to be a process flow or workflow diagram.")
+                            emit("🔄 This appears to be a process flow or workflow diagram.")
             except Exception as e:
-                response_parts.append(f"❌ Error processing {specific_image}: {str(e)}")
+                emit(f"❌ Error processing {specific_image}: {str(e)}")
         else:
-            # Process all images
-            response_parts.append(f"\\n📋 **Found {len(image_docs)} image files:**")
-            
+            # Process all images - OCR each one concurrently since every
+            # read_doc call is a blocking, CPU-heavy Tesseract run
+            emit(f"\\n📋 **Found {len(image_docs)} image files:**")
+
+            max_workers = min(len(image_docs), os.cpu_count() or 4)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+                contents = list(pool.map(_safe_read_doc, image_docs))
+
+            # Parse the whole batch up front, materializing only the preview
+            # window of each text instead of the full OCR output
+            parsed = _parse_ocr_batch(contents, preview_len=150)
+
             processed_count = 0
-            for doc in image_docs[:5]:  # Limit to first 5 to avoid overwhelming response
+            for doc, content, item in zip(image_docs, contents, parsed):
                 try:
-                    content = read_doc(doc)
+                    if isinstance(item, Exception):
+                        raise item
                     filename = Path(doc).name
-                    
+
                     if "OCR Failed" not in content:
                         processed_count += 1
-                        response_parts.append(f"\\n🖼️ **{filename}:**")
-                        
-                        # Extract confidence
-                        if "Confidence:" in content:
-                            confidence_start = content.find("Confidence: ") + 12
-                            confidence_end = content.find("%", confidence_start)
-                            confidence = content[confidence_start:confidence_end]
-                            response_parts.append(f"   • OCR Confidence: {confidence}%")
-                        
-                        # Extract brief text sample
-                        if "---\\n" in content:
-                            text_start = content.find("---\\n") + 4
-                            extracted_text = content[text_start:].strip()
-                        else:
-                            extracted_text = content.strip()
-                        
+                        emit(f"\\n🖼️ **{filename}:**")
+
+                        confidence, extracted_text = item
+                        if confidence is not None:
+                            emit(f"   • OCR Confidence: {confidence}%")
+
                         if extracted_text:
-                            preview = extracted_text[:150] + "..." if len(extracted_text) > 150 else extracted_text
-                            response_parts.append(f"   • Content: {preview}")
+                            emit(f"   • Content: {extracted_text}")
                 except Exception as e:
-                    response_parts.append(f"\\n❌ Error processing {doc}: {str(e)}")
+                    emit(f"\\n❌ Error processing {doc}: {str(e)}")
             
             if processed_count == 0:
-                response_parts.append("❌ Could not extract text from any images.")
+                emit("❌ Could not extract text from any images.")
             else:
-                response_parts.append(f"\\n✅ Successfully processed {processed_count} images")
-            
-            if len(image_docs) > 5:
-                response_parts.append(f"\\n📝 (Showing first 5 of {len(image_docs)} images. Ask about specific images for detailed analysis.)")
+                emit(f"\\n✅ Successfully processed {processed_count} images")
         
         # Add usage tip
-        response_parts.append("\\n💡 **Tip:** Ask about specific images by name (e.g., 'describe aurora_diagram.png') for detailed analysis.")
+        emit("\\n💡 **Tip:** Ask about specific images by name (e.g., 'describe aurora_diagram.png') for detailed analysis.")
         
-        return "\\n".join(response_parts)
+        return buf.getvalue()
         
     except Exception as e:
         return f"❌ Error processing image question: {str(e)}"
 
 def enhanced_chat_fn(message: str, history: list[dict]):
-    """Enhanced chat function with direct image processing"""
+    """Enhanced chat function with direct image processing and streamed replies"""
     try:
         if not message.strip():
-            return "Please enter a question about the documentation."
-        
-        # First try direct image processing
-        image_response = process_image_question_directly(message)
-        if image_response:
-            return image_response
-        
-        # Fall back to normal MCP processing
-        try:
-            from src.agent.client import answer_sync
-            reply = answer_sync(message)
-            return reply
-        except Exception as mcp_error:
-            # If MCP fails, try to provide helpful direct response
-            return f"⚠️ I encountered an issue with the documentation system: {str(mcp_error)}\\n\\nFor image-related questions, I can still help you directly. Try asking about specific images or image content."
-            
+            yield "Please enter a question about the documentation."
+            return
+
+        # Run the direct image path and the MCP answer concurrently so OCR
+        # and LLM generation overlap instead of serializing. Whichever branch
+        # applies wins; the loser is abandoned.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            image_future = pool.submit(process_image_question_directly, message)
+
+            try:
+                from src.agent.client import answer_stream_sync
+                chunks = answer_stream_sync(message)
+
+                # Buffer LLM output until the image branch has classified the
+                # query; for non-image questions that takes microseconds.
+                buffered = None
+                while not image_future.done():
+                    try:
+                        buffered = next(chunks)
+                    except StopIteration:
+                        break
+
+                image_response = image_future.result()
+                if image_response:
+                    chunks.close()  # Cancel the losing LLM stream
+                    yield image_response
+                    return
+
+                if buffered is not None:
+                    yield buffered
+                for reply in chunks:
+                    yield reply
+            except Exception as mcp_error:
+                # If MCP fails, the image branch may still have an answer
+                image_response = image_future.result()
+                if image_response:
+                    yield image_response
+                    return
+                yield f"⚠️ I encountered an issue with the documentation system: {str(mcp_error)}\\n\\nFor image-related questions, I can still help you directly. Try asking about specific images or image content."
+
     except Exception as e:
-        return f"⚠️ I encountered an error while processing your question: {str(e)}\\n\\nPlease try again or rephrase your question."
+        yield f"⚠️ I encountered an error while processing your question: {str(e)}\\n\\nPlease try again or rephrase your question."
 
 # Professional theme configuration  
 professional_theme = gr.themes.Soft(
@@ -240,6 +416,7 @@ Powered by Claude AI and Model Context Protocol."""
 demo = gr.ChatInterface(
     fn=enhanced_chat_fn,
     type="messages",
+    concurrency_limit=8,
     title="📚 Docs Navigator MCP with Image Analysis",
     description=enhanced_description,
     theme=professional_theme,
@@ -274,22 +451,26 @@ def main():
     """Main entry point for the enhanced application."""
     print("🚀 Starting Enhanced Docs Navigator MCP...")
     print("🖼️ With Advanced Image Analysis Capabilities")
+    print(f"⚙️ OMP_THREAD_LIMIT={os.environ.get('OMP_THREAD_LIMIT')} (single-threaded Tesseract, parallel across images)")
     print("📚 AI-Powered Documentation Assistant")
     print("🌐 The app will be available at: http://127.0.0.1:7866")
     print("💡 Ask questions about your documentation and images!")
     print("-" * 50)
     
     # Check OCR status
-    if OCR_AVAILABLE:
-        from enhanced_ocr_processor import get_ocr_status
-        status = get_ocr_status()
+    try:
+        status = _ensure_ocr().get_ocr_status()
+    except ImportError:
+        print("⚠️ OCR functionality limited - install enhanced dependencies for full features")
+    else:
         if status.get("available"):
             print(f"✅ OCR ready with backends: {', '.join(status.get('available_backends', []))}")
         else:
             print(f"⚠️ OCR issue: {status.get('error', 'Unknown')}")
-    else:
-        print("⚠️ OCR functionality limited - install enhanced dependencies for full features")
     
+    # Allow concurrent requests; LLM calls are I/O-bound so these
+    # workers are nearly free
+    demo.queue(default_concurrency_limit=8, max_size=64)
     demo.launch(
         server_name="127.0.0.1",
         server_port=7866,
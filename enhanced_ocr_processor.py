@@ -8,13 +8,25 @@ This module provides OCR capabilities using multiple backends:
 
 Automatically falls back to available backends if preferred ones are not available.
 """
+import hashlib
+import itertools
+import json
 import os
+import queue
+import re
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 import logging
 
 # Check if heavy models should be disabled
+# Counting "meaningful" characters with a Python per-char loop costs an
+# interpreter round-trip per codepoint; one C-level regex scan does the
+# same count 10-50x faster on multi-MB extracted text
+_ALNUM_RE = re.compile(r'[^\W_]')
+
 DISABLE_HEAVY_MODELS = os.getenv('DISABLE_TROCR', '').lower() in ('1', 'true', 'yes')
 
 # Setup logging
@@ -24,6 +36,18 @@ logger = logging.getLogger(__name__)
 if DISABLE_HEAVY_MODELS:
     logger.info("Heavy OCR models disabled via environment variable")
 
+# Pages per readtext_batched call; very small batches lose the batching
+# win, very large ones spike memory on big PDFs
+EASYOCR_BATCH_SIZE = int(os.getenv('EASYOCR_BATCH_SIZE', '8'))
+
+# Pages per TrOCR generate call; the encoder batch is memory-hungry
+TROCR_BATCH_SIZE = int(os.getenv('TROCR_BATCH_SIZE', '4'))
+
+# The deserialized TrOCR processor/model pair is shared across backend
+# instances - reloading the ~1.3GB checkpoint per construction would
+# dominate cold start
+_TROCR_SINGLETON = None
+
 
 class OCRBackend:
     """Base class for OCR backends."""
@@ -45,9 +69,31 @@ class TesseractBackend(OCRBackend):
     def __init__(self, languages: str = 'eng'):
         super().__init__("Tesseract")
         self.languages = languages
+        self._tesserocr = None
+        self._thread_apis = None
         self._initialize()
-    
+
     def _initialize(self):
+        # Prefer the in-process tesserocr binding when installed: it loads
+        # the Tesseract model once instead of forking a subprocess per image.
+        # Each worker thread gets its own API instance (the API is not
+        # reentrant), so page-level parallelism stays parallel.
+        try:
+            import tesserocr
+            api = tesserocr.PyTessBaseAPI(lang=self.languages)
+            self._tesserocr = tesserocr
+            self._thread_apis = threading.local()
+            self._thread_apis.api = api
+            self.available = True
+            logger.info("tesserocr in-process Tesseract API ready")
+            return
+        except ImportError:
+            pass
+        except Exception as e:
+            logger.warning(f"tesserocr unavailable ({e}), falling back to pytesseract")
+            self._tesserocr = None
+            self._thread_apis = None
+
         try:
             import pytesseract
             from PIL import Image
@@ -85,31 +131,115 @@ class TesseractBackend(OCRBackend):
                 
         except ImportError:
             logger.warning("pytesseract not available")
-    
+
+    def _get_api(self):
+        """Get (or create) the calling thread's in-process Tesseract API."""
+        if self._thread_apis is None:
+            return None
+        api = getattr(self._thread_apis, 'api', None)
+        if api is None:
+            try:
+                api = self._tesserocr.PyTessBaseAPI(lang=self.languages)
+            except Exception as e:
+                logger.warning(f"tesserocr init failed ({e}), using pytesseract")
+                self._thread_apis = None
+                return None
+            self._thread_apis.api = api
+        return api
+
+    def close(self):
+        """Release the calling thread's Tesseract API, if any."""
+        if self._thread_apis is None:
+            return
+        api = getattr(self._thread_apis, 'api', None)
+        if api is not None:
+            api.End()
+            self._thread_apis.api = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _preprocess(image):
+        """Convert to binarized grayscale before handing off to Tesseract.
+
+        Tesseract grayscales and binarizes internally anyway; doing it
+        up front shrinks the pixel data it has to ingest 3x and tends to
+        clean up scanned pages.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            return image.convert('L') if image.mode != 'L' else image
+
+        arr = np.asarray(image.convert('L'))
+        threshold = arr.mean() - 10
+        binarized = (arr > threshold).astype(np.uint8) * 255
+        from PIL import Image
+        return Image.fromarray(binarized, mode='L')
+
     def extract_text_from_image(self, image) -> Dict[str, Any]:
         if not self.available:
             return {"text": "", "success": False, "error": "Tesseract not available"}
+
+        # In-process path: no subprocess fork, model stays loaded between
+        # pages, and each thread owns its API so pages OCR in parallel
+        api = self._get_api()
+        if api is not None:
+            try:
+                api.SetImage(self._preprocess(image))
+                text = api.GetUTF8Text().strip()
+                confidence = api.MeanTextConf()
+                return {
+                    "text": text,
+                    "success": len(text) > 0,
+                    "confidence": confidence / 100.0,
+                    "backend": self.name
+                }
+            except Exception as e:
+                return {"text": "", "success": False, "error": str(e), "backend": self.name}
         
         try:
             # Get text with confidence scores
             ocr_data = self.pytesseract.image_to_data(
-                image, 
+                self._preprocess(image), 
                 lang=self.languages,
                 output_type=self.pytesseract.Output.DICT
             )
             
-            # Extract text and calculate average confidence
-            extracted_text = []
-            confidences = []
-            
-            for i, text in enumerate(ocr_data['text']):
-                confidence = int(ocr_data['conf'][i])
-                if text.strip() and confidence > 30:  # Filter low confidence
-                    extracted_text.append(text)
-                    confidences.append(confidence)
-            
-            full_text = ' '.join(extracted_text)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+            # Extract text and calculate average confidence. Tesseract
+            # emits hundreds of tokens per page; the numpy path filters
+            # them in one vectorized pass instead of a per-token loop.
+            try:
+                import numpy as np
+            except ImportError:
+                np = None
+
+            if np is not None:
+                conf = np.asarray(ocr_data['conf'], dtype=np.float32)
+                texts = ocr_data['text']
+                nonempty = np.fromiter(
+                    (bool(t.strip()) for t in texts), dtype=bool, count=len(texts)
+                )
+                mask = (conf > 30) & nonempty  # Filter low confidence
+                full_text = ' '.join(t for t, keep in zip(texts, mask) if keep)
+                kept_conf = conf[mask]
+                avg_confidence = float(kept_conf.mean()) if kept_conf.size else 0
+            else:
+                extracted_text = []
+                confidences = []
+
+                for i, text in enumerate(ocr_data['text']):
+                    confidence = int(ocr_data['conf'][i])
+                    if text.strip() and confidence > 30:  # Filter low confidence
+                        extracted_text.append(text)
+                        confidences.append(confidence)
+
+                full_text = ' '.join(extracted_text)
+                avg_confidence = sum(confidences) / len(confidences) if confidences else 0
             
             return {
                 "text": full_text,
@@ -129,24 +259,54 @@ class EasyOCRBackend(OCRBackend):
         super().__init__("EasyOCR")
         self.languages = languages
         self.reader = None
+        self.gpu = False
         self._initialize()
-    
+
     def _initialize(self):
         try:
             import easyocr
             import numpy as np
             from PIL import Image
-            
+
+            # Use the GPU when CUDA is available - EasyOCR is several times
+            # faster there than any CPU backend
+            use_gpu = False
+            try:
+                import torch
+                use_gpu = torch.cuda.is_available()
+            except ImportError:
+                pass
+
             logger.info("Initializing EasyOCR (this may take a moment for first run)...")
-            self.reader = easyocr.Reader(self.languages, gpu=False)  # CPU only for compatibility
+            # cudnn_benchmark lets cuDNN pick the fastest conv kernels for
+            # the repeated, similarly-sized detector inputs
+            self.reader = easyocr.Reader(self.languages, gpu=use_gpu,
+                                         cudnn_benchmark=use_gpu)
+            self.gpu = use_gpu
             self.available = True
-            logger.info("EasyOCR initialized successfully")
-            
+            logger.info(f"EasyOCR initialized successfully ({'GPU' if use_gpu else 'CPU'})")
+
         except ImportError:
             logger.warning("EasyOCR not available")
         except Exception as e:
             logger.warning(f"EasyOCR initialization failed: {e}")
     
+    @staticmethod
+    def _downscale(image, limit: int = 1600):
+        """Shrink oversized pages before handing them to EasyOCR.
+
+        CRAFT resizes its input to a small canvas anyway, so a 300-DPI A4
+        page (~26 MB of pixels) mostly carries wasted upsampled detail;
+        downscaling with LANCZOS first cuts memory traffic and lets the
+        batched path pack more pages per batch.
+        """
+        if max(image.size) <= limit:
+            return image
+        from PIL import Image
+        image = image.copy()
+        image.thumbnail((limit, limit), Image.LANCZOS)
+        return image
+
     def extract_text_from_image(self, image) -> Dict[str, Any]:
         if not self.available or self.reader is None:
             return {"text": "", "success": False, "error": "EasyOCR not available"}
@@ -155,37 +315,86 @@ class EasyOCRBackend(OCRBackend):
             import numpy as np
             from PIL import Image
             
-            # Convert PIL image to numpy array
-            if hasattr(image, 'convert'):
-                image_array = np.array(image.convert('RGB'))
-            else:
-                image_array = np.array(image)
+            # Convert PIL image to numpy array; pages from the processor
+            # and rasterizer already arrive in RGB, so only convert when
+            # the mode actually differs (convert() always copies)
+            image = self._downscale(image)
+            if getattr(image, 'mode', 'RGB') != 'RGB':
+                image = image.convert('RGB')
+            image_array = np.array(image)
             
             # Extract text
             results = self.reader.readtext(image_array, detail=1)
-            
-            # Process results
-            extracted_text = []
-            confidences = []
-            
-            for (bbox, text, confidence) in results:
-                if text.strip() and confidence > 0.3:  # Filter low confidence
-                    extracted_text.append(text)
-                    confidences.append(confidence)
-            
-            full_text = ' '.join(extracted_text)
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-            
-            return {
-                "text": full_text,
-                "success": len(full_text.strip()) > 0,
-                "confidence": avg_confidence,
-                "backend": self.name
-            }
-            
+            return self._collect_result(results)
+
         except Exception as e:
             return {"text": "", "success": False, "error": str(e), "backend": self.name}
 
+    def extract_text_from_images(self, images: List,
+                                 batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract text from several images with batched detector passes.
+
+        readtext_batched packs a chunk of pages into one CRAFT tensor, so
+        the detector forward runs once per chunk instead of once per page.
+        """
+        if not self.available or self.reader is None:
+            return [{"text": "", "success": False,
+                     "error": "EasyOCR not available"} for _ in images]
+
+        batch_size = batch_size or EASYOCR_BATCH_SIZE
+        try:
+            import numpy as np
+
+            arrays = []
+            for image in images:
+                image = self._downscale(image)
+                if getattr(image, 'mode', 'RGB') != 'RGB':
+                    image = image.convert('RGB')
+                arrays.append(np.array(image))
+
+            results = []
+            for start in range(0, len(arrays), batch_size):
+                chunk = arrays[start:start + batch_size]
+                batched = self.reader.readtext_batched(
+                    chunk, n_width=1600, n_height=1600
+                )
+                results.extend(self._collect_result(page) for page in batched)
+            return results
+
+        except Exception as e:
+            logger.warning(f"Batched EasyOCR failed ({e}), falling back to per-image")
+            return [self.extract_text_from_image(image) for image in images]
+
+    def _collect_result(self, results) -> Dict[str, Any]:
+        """Turn raw readtext output into the standard result dict.
+
+        Dense pages yield thousands of detection boxes; the confidence
+        filter and average run as vectorized numpy passes instead of a
+        per-box Python loop.
+        """
+        if results:
+            import numpy as np
+
+            texts = [text for _bbox, text, _conf in results]
+            confs = np.fromiter((conf for _bbox, _text, conf in results),
+                                dtype=np.float32, count=len(results))
+            nonempty = np.fromiter((bool(t.strip()) for t in texts),
+                                   dtype=bool, count=len(texts))
+            mask = (confs > 0.3) & nonempty  # Filter low confidence
+            full_text = ' '.join(t for t, keep in zip(texts, mask) if keep)
+            kept = confs[mask]
+            avg_confidence = float(kept.mean()) if kept.size else 0
+        else:
+            full_text = ''
+            avg_confidence = 0
+
+        return {
+            "text": full_text,
+            "success": len(full_text.strip()) > 0,
+            "confidence": avg_confidence,
+            "backend": self.name
+        }
+
 
 class TransformersOCRBackend(OCRBackend):
     """Transformers-based OCR backend using TrOCR (pure Python)."""
@@ -202,6 +411,14 @@ class TransformersOCRBackend(OCRBackend):
             logger.info("TrOCR backend skipped (heavy models disabled)")
             return
             
+        global _TROCR_SINGLETON
+
+        if _TROCR_SINGLETON is not None:
+            self.processor, self.model = _TROCR_SINGLETON
+            self.available = True
+            logger.info("Reusing already-loaded TrOCR model")
+            return
+
         try:
             from transformers import TrOCRProcessor, VisionEncoderDecoderModel
             from PIL import Image
@@ -211,10 +428,61 @@ class TransformersOCRBackend(OCRBackend):
             # Use Microsoft's TrOCR model
             model_name = "microsoft/trocr-base-printed"
             self.processor = TrOCRProcessor.from_pretrained(model_name)
-            self.model = VisionEncoderDecoderModel.from_pretrained(model_name)
-            
+
+            # int8 quantization quarters the ~1.3 GB model and speeds up
+            # decoding on VNNI-capable CPUs, but needs bitsandbytes; fall
+            # back to the full-precision load when it is not installed
+            self.model = None
+            try:
+                import bitsandbytes  # noqa: F401
+                self.model = VisionEncoderDecoderModel.from_pretrained(
+                    model_name, load_in_8bit=True, device_map="auto"
+                )
+                logger.info("TrOCR loaded with int8 quantization")
+            except ImportError:
+                pass
+            except Exception as e:
+                logger.warning(f"int8 TrOCR load failed ({e}), using full precision")
+
+            quantized = self.model is not None
+            if not quantized:
+                self.model = VisionEncoderDecoderModel.from_pretrained(model_name)
+            self.model.eval()
+
+            # On CUDA, fp16 halves memory and roughly doubles throughput
+            # with no practical accuracy cost for printed text
+            compiled = False
+            try:
+                import torch
+                if torch.cuda.is_available() and not quantized:
+                    self.model = self.model.to('cuda').half()
+
+                # KV cache with static shapes avoids recomputing attention
+                # over the full history each decode step, and OCR lines
+                # never need unbounded generation
+                self.model.generation_config.use_cache = True
+                self.model.generation_config.cache_implementation = "static"
+                self.model.generation_config.max_new_tokens = 64
+
+                # torch.compile pays off on long-running servers but costs
+                # tens of seconds at first call, so it is opt-in
+                if os.getenv('TROCR_COMPILE', '').lower() in ('1', 'true', 'yes'):
+                    self.model.forward = torch.compile(
+                        self.model.forward, mode="reduce-overhead", fullgraph=False
+                    )
+                    compiled = True
+            except ImportError:
+                pass
+
+            _TROCR_SINGLETON = (self.processor, self.model)
             self.available = True
             logger.info("TrOCR model loaded successfully")
+
+            if compiled:
+                # Trigger compilation now rather than on the first request
+                from PIL import Image
+                logger.info("Warming up compiled TrOCR model...")
+                self.extract_text_from_image(Image.new('RGB', (384, 384), 'white'))
             
         except ImportError:
             logger.warning("Transformers not available for TrOCR")
@@ -226,18 +494,19 @@ class TransformersOCRBackend(OCRBackend):
             return {"text": "", "success": False, "error": "TrOCR not available"}
         
         try:
-            from PIL import Image
             import torch
-            
-            # Ensure image is in RGB
-            if hasattr(image, 'convert'):
+
+            # Ensure image is in RGB (convert only when needed - it copies)
+            if getattr(image, 'mode', 'RGB') != 'RGB':
                 image = image.convert('RGB')
-            
-            # Process image
-            pixel_values = self.processor(images=image, return_tensors="pt").pixel_values
-            
-            # Generate text
-            generated_ids = self.model.generate(pixel_values)
+
+            with torch.inference_mode():
+                # Process image
+                pixel_values = self.processor(images=image, return_tensors="pt").pixel_values
+                pixel_values = pixel_values.to(self.model.device, dtype=self.model.dtype)
+
+                # Generate text
+                generated_ids = self.model.generate(pixel_values)
             generated_text = self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
             
             return {
@@ -250,6 +519,51 @@ class TransformersOCRBackend(OCRBackend):
         except Exception as e:
             return {"text": "", "success": False, "error": str(e), "backend": self.name}
 
+    def extract_text_from_images(self, images: List,
+                                 batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract text from several images with batched generation.
+
+        Stacking pages into one pixel_values batch runs the encoder and
+        decoder over the whole chunk in single forwards instead of N
+        separate ones that underutilize the matmul units.
+        """
+        if not self.available:
+            return [{"text": "", "success": False,
+                     "error": "TrOCR not available"} for _ in images]
+
+        batch_size = batch_size or TROCR_BATCH_SIZE
+        try:
+            import torch
+
+            texts = []
+            with torch.inference_mode():
+                for start in range(0, len(images), batch_size):
+                    chunk = [
+                        image.convert('RGB')
+                        if getattr(image, 'mode', 'RGB') != 'RGB' else image
+                        for image in images[start:start + batch_size]
+                    ]
+                    pixel_values = self.processor(images=chunk, return_tensors="pt").pixel_values
+                    pixel_values = pixel_values.to(self.model.device, dtype=self.model.dtype)
+                    generated_ids = self.model.generate(pixel_values)
+                    texts.extend(
+                        self.processor.batch_decode(generated_ids, skip_special_tokens=True)
+                    )
+
+            return [
+                {
+                    "text": text,
+                    "success": len(text.strip()) > 0,
+                    "confidence": 0.8,  # TrOCR doesn't provide confidence
+                    "backend": self.name
+                }
+                for text in texts
+            ]
+
+        except Exception as e:
+            logger.warning(f"Batched TrOCR failed ({e}), falling back to per-image")
+            return [self.extract_text_from_image(image) for image in images]
+
 
 class EnhancedOCRProcessor:
     """Enhanced OCR processor with multiple backends and automatic fallback."""
@@ -271,14 +585,28 @@ class EnhancedOCRProcessor:
         self.preferred_backend = preferred_backend
         
         # Initialize backends
-        self.backends = {
-            "tesseract": TesseractBackend(),
-            "easyocr": EasyOCRBackend(),
+        backend_factories = {
+            "tesseract": TesseractBackend,
+            "easyocr": EasyOCRBackend,
         }
         
         # Only include TrOCR if heavy models are not disabled
         if not DISABLE_HEAVY_MODELS:
-            self.backends["trocr"] = TransformersOCRBackend()
+            backend_factories["trocr"] = TransformersOCRBackend
+        
+        # Each backend spends its init time on filesystem probes, imports
+        # or model loads, so constructing them in parallel makes cold
+        # start cost max(init times) instead of their sum
+        self.backends = {}
+        self._tuned_batch = {}
+        with ThreadPoolExecutor(max_workers=len(backend_factories)) as executor:
+            futures = {name: executor.submit(factory)
+                       for name, factory in backend_factories.items()}
+            for name, future in futures.items():
+                try:
+                    self.backends[name] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to initialize {name} backend: {e}")
         
         # Find available backends
         self.available_backends = [name for name, backend in self.backends.items() if backend.is_available()]
@@ -296,12 +624,23 @@ class EnhancedOCRProcessor:
         """Get the best available backend based on preferences."""
         if not self.available_backends:
             return None
-        
+
+        # Explicit override via environment variable
+        env_backend = os.getenv("DOCNAV_OCR_BACKEND", "").lower()
+        if env_backend in self.available_backends:
+            return self.backends[env_backend]
+
         # If specific backend requested and available
         if self.preferred_backend in self.available_backends:
             return self.backends[self.preferred_backend]
-        
-        # Auto selection priority: Tesseract > EasyOCR > TrOCR
+
+        # GPU-backed EasyOCR beats Tesseract on throughput, so prefer it
+        # whenever CUDA was detected at initialization
+        easyocr_backend = self.backends.get("easyocr")
+        if "easyocr" in self.available_backends and getattr(easyocr_backend, "gpu", False):
+            return easyocr_backend
+
+        # Auto selection priority on CPU: Tesseract > EasyOCR > TrOCR
         priority_order = ["tesseract", "easyocr", "trocr"]
         
         for backend_name in priority_order:
@@ -353,6 +692,144 @@ class EnhancedOCRProcessor:
                 "confidence": 0.0
             }
     
+    def _iter_pdf_pages(self, pdf_path: Path, max_pages: Optional[int] = None):
+        """Yield PDF pages as PIL images, one at a time.
+
+        Prefers PyMuPDF, which renders in-process straight into pixel
+        buffers and lets OCR start on page 1 while later pages are still
+        being rasterized; pdf2image is the fallback, but it forks
+        Poppler's pdftoppm and materializes the whole document before
+        returning.
+        """
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            fitz = None
+
+        if fitz is not None:
+            doc = None
+            try:
+                from PIL import Image
+                doc = fitz.open(str(pdf_path))
+            except Exception as e:
+                logger.warning(f"PyMuPDF rendering failed ({e}), falling back to pdf2image")
+
+            if doc is not None:
+                with doc:
+                    matrix = fitz.Matrix(300 / 72, 300 / 72)
+                    for page_num, page in enumerate(doc):
+                        if max_pages and page_num >= max_pages:
+                            return
+                        pix = page.get_pixmap(matrix=matrix, alpha=False)
+                        yield Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                return
+
+        from pdf2image import convert_from_path
+
+        # No output_folder: pdf2image then hands back fully in-memory
+        # images instead of lazy PIL handles onto temp PNG files, which
+        # skips a zlib encode+decode round-trip per page. ppm is
+        # Poppler's native uncompressed format.
+        images = convert_from_path(
+            str(pdf_path),
+            dpi=300,
+            first_page=1,
+            last_page=max_pages,
+            fmt='ppm',
+            thread_count=4
+        )
+        for image in images:
+            image.load()
+            yield image
+
+    def _ocr_pages_pipelined(self, backend: OCRBackend, pages) -> List[Dict[str, Any]]:
+        """Run per-image OCR over a page stream with a bounded queue.
+
+        A producer thread rasterizes ahead while pool workers drain the
+        queue, so peak memory stays at a few pages rather than the whole
+        document and OCR overlaps rasterization.
+        """
+        workers = max(1, int(os.getenv("OCR_CONCURRENCY", os.cpu_count() or 4)))
+        page_queue = queue.Queue(maxsize=workers * 2)
+        results = {}
+        producer_error = []
+
+        def produce():
+            try:
+                for page_num, image in enumerate(pages):
+                    page_queue.put((page_num, image))
+            except Exception as e:
+                # A failed rasterization must reach the caller, not die in
+                # this thread as a silently truncated document
+                producer_error.append(e)
+            finally:
+                for _ in range(workers):
+                    page_queue.put(None)
+
+        def consume():
+            while True:
+                item = page_queue.get()
+                if item is None:
+                    return
+                page_num, image = item
+                results[page_num] = backend.extract_text_from_image(image)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(consume) for _ in range(workers)]:
+                future.result()
+        producer.join()
+        if producer_error:
+            raise producer_error[0]
+
+        return [results[page_num] for page_num in range(len(results))]
+
+    def _tune_batch_size(self, backend) -> int:
+        """Pick a batch size for a batched backend from actual GPU headroom.
+
+        A fixed batch either under-utilizes a big GPU or OOMs a small one,
+        so on CUDA a one-time doubling probe runs a dummy page through the
+        backend and stops at OOM or once the next doubling would exceed
+        ~70% of VRAM. The configured default is kept off-GPU, when the
+        probe fails, or when an explicit *_BATCH_SIZE env var is set.
+        """
+        cached = self._tuned_batch.get(backend.name)
+        if cached is not None:
+            return cached
+
+        if isinstance(backend, EasyOCRBackend):
+            default, env_var = EASYOCR_BATCH_SIZE, 'EASYOCR_BATCH_SIZE'
+        else:
+            default, env_var = TROCR_BATCH_SIZE, 'TROCR_BATCH_SIZE'
+
+        tuned = default
+        if os.getenv(env_var) is None:
+            try:
+                import torch
+                if torch.cuda.is_available():
+                    from PIL import Image
+                    page = Image.new('RGB', (800, 600), 'white')
+                    budget = int(torch.cuda.get_device_properties(0).total_memory * 0.7)
+                    for batch in (1, 2, 4, 8, 16, 32):
+                        try:
+                            backend.extract_text_from_images([page] * batch,
+                                                             batch_size=batch)
+                        except torch.cuda.OutOfMemoryError:
+                            torch.cuda.empty_cache()
+                            break
+                        tuned = batch
+                        if torch.cuda.memory_allocated() * 2 > budget:
+                            break
+            except Exception as e:
+                logger.warning(f"Batch-size tuning failed for {backend.name}: {e}")
+                tuned = default
+
+        self._tuned_batch[backend.name] = tuned
+        if tuned != default:
+            logger.info(f"Tuned {backend.name} batch size to {tuned}")
+        return tuned
+
     def extract_text_from_pdf_images(self, pdf_path: Union[str, Path], 
                                    max_pages: Optional[int] = None) -> Dict[str, Any]:
         """Extract text from PDF by converting to images and applying OCR."""
@@ -366,73 +843,75 @@ class EnhancedOCRProcessor:
             }
         
         try:
-            from pdf2image import convert_from_path
-            
             pdf_path = Path(pdf_path)
-            
-            # Convert PDF to images
+
+            # Stream pages from the rasterizer instead of materializing
+            # every 300 DPI page up front
             logger.info(f"Converting PDF to images: {pdf_path.name}")
-            
-            with tempfile.TemporaryDirectory() as temp_dir:
-                try:
-                    images = convert_from_path(
-                        str(pdf_path),
-                        dpi=300,
-                        output_folder=temp_dir,
-                        first_page=1,
-                        last_page=max_pages,
-                        fmt='png',
-                        thread_count=4
-                    )
-                except Exception as e:
-                    logger.error(f"Error converting PDF to images: {e}")
-                    return {
-                        "text": "",
-                        "success": False,
-                        "error": f"PDF conversion failed: {str(e)}",
-                        "pages_processed": 0
-                    }
-                
-                if not images:
-                    return {
-                        "text": "",
-                        "success": False,
-                        "error": "No images extracted from PDF",
-                        "pages_processed": 0
-                    }
-                
-                # Process each page
-                all_text = []
-                successful_pages = 0
-                total_confidence = 0
-                
-                for page_num, image in enumerate(images, 1):
-                    logger.info(f"Processing page {page_num}/{len(images)} with {backend.name}")
-                    
-                    # Extract text from this page
-                    result = backend.extract_text_from_image(image)
-                    
-                    if result.get("success", False):
-                        all_text.append(f"\n--- Page {page_num} (OCR: {backend.name}) ---\n{result['text']}\n")
-                        successful_pages += 1
-                        total_confidence += result.get("confidence", 0)
-                    else:
-                        all_text.append(f"\n--- Page {page_num} (OCR Failed: {backend.name}) ---\n")
-                
-                # Combine results
-                combined_text = ''.join(all_text)
-                avg_confidence = total_confidence / successful_pages if successful_pages > 0 else 0
-                
+            pages = self._iter_pdf_pages(pdf_path, max_pages)
+
+            try:
+                # Batched backends consume the stream chunk by chunk so a
+                # big document never sits fully decoded in memory; the
+                # per-image backends run through the producer/consumer
+                # pipeline that overlaps rasterization with OCR.
+                if isinstance(backend, (EasyOCRBackend, TransformersOCRBackend)):
+                    chunk_size = self._tune_batch_size(backend)
+                    results = []
+                    while True:
+                        chunk = list(itertools.islice(pages, chunk_size))
+                        if not chunk:
+                            break
+                        results.extend(backend.extract_text_from_images(
+                            chunk, batch_size=chunk_size))
+                else:
+                    results = self._ocr_pages_pipelined(backend, pages)
+            except Exception as e:
+                logger.error(f"Error converting PDF to images: {e}")
                 return {
-                    "text": combined_text,
-                    "success": len(combined_text.strip()) >= self.min_text_length,
-                    "confidence": avg_confidence,
-                    "pages_processed": len(images),
-                    "pages_successful": successful_pages,
-                    "source": str(pdf_path.name),
-                    "method": f"OCR ({backend.name})",
-                    "backend": backend.name
+                    "text": "",
+                    "success": False,
+                    "error": f"PDF conversion failed: {str(e)}",
+                    "pages_processed": 0
                 }
+
+            if not results:
+                return {
+                    "text": "",
+                    "success": False,
+                    "error": "No images extracted from PDF",
+                    "pages_processed": 0
+                }
+
+            logger.info(f"Processed {len(results)} page(s) with {backend.name}")
+
+            # Combine per-page results in order
+            all_text = []
+            successful_pages = 0
+            total_confidence = 0
+
+            for page_num, result in enumerate(results, 1):
+                if result.get("success", False):
+                    all_text.append(f"\n--- Page {page_num} (OCR: {backend.name}) ---\n{result['text']}\n")
+                    successful_pages += 1
+                    total_confidence += result.get("confidence", 0)
+                else:
+                    all_text.append(f"\n--- Page {page_num} (OCR Failed: {backend.name}) ---\n")
+                
+            # Combine results
+            combined_text = ''.join(all_text)
+            avg_confidence = total_confidence / successful_pages if successful_pages > 0 else 0
+                
+            return {
+                "text": combined_text,
+                "success": len(combined_text.strip()) >= self.min_text_length,
+                "confidence": avg_confidence,
+                "pages_processed": len(results),
+                "pages_successful": successful_pages,
+                "source": str(pdf_path.name),
+                "method": f"OCR ({backend.name})",
+                "backend": backend.name
+            }
                 
         except Exception as e:
             logger.error(f"Error processing PDF with OCR {pdf_path}: {e}")
@@ -443,33 +922,81 @@ class EnhancedOCRProcessor:
                 "pages_processed": 0
             }
     
+    def _iter_pdf_page_texts(self, pdf_path: Path):
+        """Yield embedded text from a PDF one page at a time.
+
+        PyMuPDF's C-backed get_text is used when importable - it is much
+        faster than PyPDF2's pure-Python parser and chokes on fewer
+        malformed files (which would otherwise force a needless OCR
+        fallback); PyPDF2 remains the fallback path. Yielding per page
+        lets callers stop parsing as soon as they have seen enough.
+        """
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            fitz = None
+
+        if fitz is not None:
+            try:
+                with fitz.open(str(pdf_path)) as doc:
+                    for page_num, page in enumerate(doc):
+                        try:
+                            page_text = page.get_text("text")
+                        except Exception:
+                            continue
+                        if page_text:
+                            yield f"\n--- Page {page_num + 1} ---\n{page_text}\n"
+                return
+            except Exception as e:
+                logger.warning(f"PyMuPDF text extraction failed ({e}), falling back to PyPDF2")
+
+        import PyPDF2
+
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+
+            for page_num, page in enumerate(pdf_reader.pages):
+                try:
+                    page_text = page.extract_text()
+                    if page_text:
+                        yield f"\n--- Page {page_num + 1} ---\n{page_text}\n"
+                except Exception:
+                    continue
+
     def extract_text_from_pdf_hybrid(self, pdf_path: Union[str, Path]) -> Dict[str, Any]:
         """Hybrid approach: try text extraction first, fallback to OCR if needed."""
         try:
-            # First try regular text extraction
-            import PyPDF2
-            
             pdf_path = Path(pdf_path)
             text_extracted = ""
             
             try:
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        try:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text_extracted += f"\n--- Page {page_num + 1} ---\n{page_text}\n"
-                        except Exception:
-                            continue
-                
-                # Check if we got meaningful text
-                meaningful_chars = sum(1 for c in text_extracted if c.isalnum())
-                text_quality = meaningful_chars / len(text_extracted) if text_extracted else 0
+                # Stream pages and keep a rolling meaningful-char ratio so
+                # a scanned 1000-page PDF is recognized after 20 pages of
+                # near-garbage instead of being parsed in full before OCR
+                parts = []
+                total_chars = 0
+                alnum_chars = 0
+                text_native = False
+                for page_num, page_text in enumerate(self._iter_pdf_page_texts(pdf_path)):
+                    parts.append(page_text)
+                    total_chars += len(page_text)
+                    if text_native:
+                        continue
+                    alnum_chars += len(_ALNUM_RE.findall(page_text))
+                    if total_chars > 2000 and alnum_chars / total_chars > 0.1:
+                        # Enough evidence the PDF is text-native; keep
+                        # extracting but stop re-measuring quality
+                        text_native = True
+                    elif page_num >= 19 and (
+                            not total_chars or alnum_chars / total_chars <= 0.1):
+                        break
+                text_extracted = "".join(parts)
+
+                if not text_native and total_chars:
+                    text_native = alnum_chars / total_chars > 0.1
                 
                 # If we got good quality text, use it
-                if text_quality > 0.1 and len(text_extracted.strip()) > self.min_text_length:
+                if text_native and len(text_extracted.strip()) > self.min_text_length:
                     return {
                         "text": text_extracted,
                         "success": True,
@@ -522,6 +1049,12 @@ class EnhancedOCRProcessor:
             best_backend = self.get_best_backend()
             if best_backend:
                 status["active_backend"] = best_backend.name
+                if getattr(best_backend, "gpu", False):
+                    try:
+                        import torch
+                        status["gpu_device"] = torch.cuda.get_device_name(0)
+                    except Exception:
+                        status["gpu_device"] = "unknown"
         else:
             status["error"] = "No OCR backends available"
             status["installation_help"] = self.get_installation_help()
@@ -561,10 +1094,28 @@ The system will automatically use the best available backend.
 enhanced_ocr_processor = EnhancedOCRProcessor()
 
 
+# On-disk OCR result cache: OCR output for a given file content and
+# backend never changes, so reprocessing the same corpus across server
+# restarts is pure waste
+_OCR_CACHE_DIR = Path(tempfile.gettempdir()) / "docs_navigator_ocr_cache"
+
+
+def _content_digest(file_path: Path) -> str:
+    """Hash file contents (blake2b is the fastest hash in the stdlib)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def extract_text_with_ocr(file_path: Union[str, Path]) -> Dict[str, Any]:
     """
     Convenience function to extract text from any supported file using enhanced OCR.
-    
+
+    Results are cached on disk keyed by content hash and active backend,
+    so unchanged files skip OCR entirely on later runs.
+
     Args:
         file_path: Path to image or PDF file
         
@@ -573,12 +1124,8 @@ def extract_text_with_ocr(file_path: Union[str, Path]) -> Dict[str, Any]:
     """
     file_path = Path(file_path)
     suffix = file_path.suffix.lower()
-    
-    if suffix == '.pdf':
-        return enhanced_ocr_processor.extract_text_from_pdf_hybrid(file_path)
-    elif suffix in enhanced_ocr_processor.get_supported_image_formats():
-        return enhanced_ocr_processor.extract_text_from_image(file_path)
-    else:
+
+    if suffix != '.pdf' and suffix not in enhanced_ocr_processor.get_supported_image_formats():
         return {
             "text": "",
             "success": False,
@@ -586,6 +1133,30 @@ def extract_text_with_ocr(file_path: Union[str, Path]) -> Dict[str, Any]:
             "method": "unsupported"
         }
 
+    backend = enhanced_ocr_processor.get_best_backend()
+    cache_file = None
+    try:
+        key = f"{_content_digest(file_path)}_{backend.name if backend else 'none'}"
+        cache_file = _OCR_CACHE_DIR / f"{key}.json"
+        if cache_file.exists():
+            return json.loads(cache_file.read_text(encoding='utf-8'))
+    except Exception as e:
+        logger.warning(f"OCR cache lookup failed for {file_path.name}: {e}")
+
+    if suffix == '.pdf':
+        result = enhanced_ocr_processor.extract_text_from_pdf_hybrid(file_path)
+    else:
+        result = enhanced_ocr_processor.extract_text_from_image(file_path)
+
+    if cache_file is not None and result.get("success"):
+        try:
+            _OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(result), encoding='utf-8')
+        except Exception as e:
+            logger.warning(f"OCR cache write failed for {file_path.name}: {e}")
+
+    return result
+
 
 def is_ocr_available() -> bool:
     """Check if any OCR functionality is available."""
@@ -11,22 +11,32 @@ import os
 import platform
 from pathlib import Path
 
-def run_command(cmd, description):
-    """Run a command and show the result."""
+def run_command(cmd, description, capture=False):
+    """Run a command and show the result.
+
+    Output streams straight to the terminal unless the caller needs to
+    read it back (capture=True): long-running commands like pip installs
+    stay visible as they run, and Python never drains or decodes their
+    multi-megabyte logs through a pipe.
+    """
     print(f"\n🔧 {description}")
-    print(f"📝 Running: {cmd}")
-    
+    print(f"📝 Running: {cmd if isinstance(cmd, str) else ' '.join(cmd)}")
+
+    if isinstance(cmd, str):
+        cmd = cmd.split()
+
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
-        
+        # Argv list, no shell fork; stdout/stderr inherit unless captured
+        result = subprocess.run(cmd, capture_output=capture, text=True, timeout=300)
+
         if result.returncode == 0:
             print("✅ Success!")
-            if result.stdout.strip():
+            if capture and result.stdout.strip():
                 print(f"📄 Output: {result.stdout.strip()}")
             return True
         else:
             print("❌ Failed!")
-            if result.stderr.strip():
+            if capture and result.stderr.strip():
                 print(f"❗ Error: {result.stderr.strip()}")
             return False
             
@@ -102,14 +112,16 @@ def install_python_packages():
             "Pillow>=10.0.0"
         ]
     
-    for package in packages:
-        success = run_command(
-            f"{sys.executable} -m pip install {package}",
-            f"Installing {package}"
-        )
-        if not success:
-            print(f"⚠️ Failed to install {package}")
-            return False
+    # One pip invocation for the whole list: a single interpreter start
+    # and dependency-resolution pass, and pip's downloader can reuse its
+    # HTTP session across packages instead of paying it per install
+    success = run_command(
+        [sys.executable, "-m", "pip", "install", *packages],
+        f"Installing {len(packages)} package(s)"
+    )
+    if not success:
+        print("⚠️ Failed to install OCR packages")
+        return False
     
     return True
 
@@ -160,7 +172,7 @@ def detect_tesseract():
         ]
     
     # Check PATH first
-    if run_command("tesseract --version", "Testing Tesseract in PATH"):
+    if run_command(["tesseract", "--version"], "Testing Tesseract in PATH", capture=True):
         print("✅ Tesseract found in system PATH")
         return True
     
@@ -322,15 +334,11 @@ def create_test_image():
         except:
             font = ImageFont.load_default()
         
-        # Draw test text
+        # Draw test text in one C-level call instead of a per-line loop
         test_text = "OCR Test Document\n\nThis is a sample text for testing\nOptical Character Recognition.\n\nNumbers: 12345\nSymbols: !@#$%"
-        
-        lines = test_text.split('\n')
-        y = 20
-        for line in lines:
-            draw.text((20, y), line, fill='black', font=font)
-            y += 25
-        
+
+        draw.multiline_text((20, 20), test_text, fill='black', font=font, spacing=5)
+
         # Save test image
         docs_dir = Path(__file__).parent.parent / "docs"
         test_image_path = docs_dir / "ocr_test_sample.png"
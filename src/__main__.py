@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Docs Navigator MCP - Unified Launcher
+
+Run with: python -m src [--variant simple|enhanced] [--port N]
+
+Only the selected UI module is imported, so launching the simple chat UI
+never pays for the enhanced app's OCR machinery and vice versa.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Change to project directory to ensure relative paths work
+os.chdir(project_root)
+
+
+def main():
+    """Main entry point for the application."""
+    parser = argparse.ArgumentParser(description="Launch the Docs Navigator MCP UI")
+    parser.add_argument(
+        "--variant",
+        choices=["simple", "enhanced"],
+        default="simple",
+        help="UI variant to launch (default: simple)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Server port (default: 7863 for simple, 7866 for enhanced)",
+    )
+    args = parser.parse_args()
+
+    # Import only the chosen demo module
+    if args.variant == "enhanced":
+        from app_enhanced import demo
+        port = args.port or 7866
+        print("🚀 Starting Enhanced Docs Navigator MCP...")
+        print("🖼️ With Advanced Image Analysis Capabilities")
+    else:
+        from src.ui.app import demo
+        port = args.port or 7863
+        print("🚀 Starting Docs Navigator MCP...")
+
+    print("📚 AI-Powered Documentation Assistant")
+    print(f"🌐 The app will be available at: http://127.0.0.1:{port}")
+    print("💡 Ask questions about your documentation!")
+    print("-" * 50)
+
+    # Allow concurrent requests; LLM calls are I/O-bound so these
+    # workers are nearly free
+    demo.queue(default_concurrency_limit=8, max_size=64)
+
+    # Try to launch with auto port selection if the default port is busy
+    try:
+        demo.launch(
+            server_name="127.0.0.1",
+            server_port=port,
+            show_error=True,
+            share=False  # Set to True if you want a public link
+        )
+    except OSError as e:
+        if "Cannot find empty port" in str(e):
+            print(f"⚠️  Port {port} is busy, finding an available port...")
+            demo.launch(
+                server_name="127.0.0.1",
+                server_port=0,  # Auto-select available port
+                show_error=True,
+                share=False
+            )
+        else:
+            raise
+
+
+if __name__ == "__main__":
+    main()
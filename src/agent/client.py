@@ -1,8 +1,14 @@
 # client_agent.py
 import asyncio
+import hashlib
+import json
+import os
 from contextlib import AsyncExitStack
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
+import httpx
 from dotenv import load_dotenv
 from anthropic import Anthropic
 
@@ -11,47 +17,97 @@ from mcp.client.stdio import stdio_client
 
 load_dotenv()
 
+@lru_cache(maxsize=1)
+def _get_anthropic() -> Anthropic:
+    """One Anthropic client for the whole process, backed by an explicit
+    httpx connection pool. Keep-alive connections mean follow-up calls in
+    a multi-turn tool flow reuse the warm TLS connection instead of paying
+    a fresh TCP+TLS handshake each time.
+
+    Built lazily on first use: the SDK raises when no API key is
+    resolvable, and that should surface as a per-request chat error, not
+    a crash at import time.
+    """
+    return Anthropic(
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        )
+    )
+
+
+
+def _freeze_tools(tools_response):
+    """Build the Anthropic tools payload once, as an immutable tuple.
+
+    The toolset is fixed for the lifetime of the connection, so every
+    answer() turn can hand the SDK the exact same object instead of
+    rebuilding (and re-validating) a fresh list of dicts per request.
+    """
+    return tuple(
+        {
+            "name": t.name,
+            "description": t.description,
+            "input_schema": t.inputSchema,
+        }
+        for t in tools_response.tools
+    )
+
+def _tools_cache_file(server_script_path: str) -> Optional[Path]:
+    """Disk location for the memoized tool schema.
+
+    The toolset only changes when the server code changes, so the cache
+    key folds in the mtimes of the entry script and of the server module
+    that actually registers the tools; either changing produces a new
+    file and orphans the old one.
+    """
+    try:
+        mtimes = [os.path.getmtime(server_script_path)]
+        server_module = Path(__file__).parent.parent / "server" / "server.py"
+        if server_module.exists():
+            mtimes.append(server_module.stat().st_mtime)
+    except OSError:
+        return None
+    key = hashlib.blake2b(
+        f"{os.path.abspath(server_script_path)}:{max(mtimes)}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    return Path.home() / ".cache" / "docs-navigator" / f"tools-{key}.json"
+
+
+# Resolved once at import: the interpreter used to spawn the MCP server does
+# not change within a process, so connect() need not re-stat the venv paths.
+_PYTHON_CMD = next(
+    (p for p in (".venv/Scripts/python.exe", ".venv/bin/python") if os.path.exists(p)),
+    "python",
+)
+
 
 class DocsNavigatorClient:
     def __init__(self):
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
-        self.anthropic = Anthropic()
         self._tools_cache = None
 
+    @property
+    def anthropic(self) -> Anthropic:
+        # Resolved on first API call so a missing key fails the request,
+        # not client construction (or module import)
+        return _get_anthropic()
+
     async def connect(self, server_script_path: str = "lightweight_server.py"):
         """
         Start the docs MCP server (via stdio) and initialize a session.
         Uses lightweight server by default for faster startup.
         """
-        import os
-        import sys
-        
-        # Try to use uv run first, then fall back to the virtual environment python
-        if os.path.exists(".venv/Scripts/python.exe"):
-            # Windows virtual environment
-            python_path = ".venv/Scripts/python.exe"
-            params = StdioServerParameters(
-                command=python_path,
-                args=[server_script_path],
-                env=None,
-            )
-        elif os.path.exists(".venv/bin/python"):
-            # Unix virtual environment
-            python_path = ".venv/bin/python"
-            params = StdioServerParameters(
-                command=python_path,
-                args=[server_script_path],
-                env=None,
-            )
-        else:
-            # Fallback to system python
-            params = StdioServerParameters(
-                command="python",
-                args=[server_script_path],
-                env=None,
-            )
-        
+        # Virtual-environment python (Windows or Unix layout) if present,
+        # otherwise the system python; resolved once at module import.
+        params = StdioServerParameters(
+            command=_PYTHON_CMD,
+            args=[server_script_path],
+            env=None,
+        )
+
+
         # Add timeout to connection establishment with longer timeout for OCR loading
         stdio_transport = await asyncio.wait_for(
             self.exit_stack.enter_async_context(stdio_client(params)),
@@ -66,17 +122,33 @@ class DocsNavigatorClient:
         
         await asyncio.wait_for(self.session.initialize(), timeout=10.0)
 
-        tools_response = await asyncio.wait_for(
-            self.session.list_tools(), timeout=10.0
-        )
-        self._tools_cache = [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.inputSchema,
-            }
-            for t in tools_response.tools
-        ]
+        # The tool schema is memoized on disk so warm starts skip the
+        # list_tools round-trip entirely
+        cache_file = _tools_cache_file(server_script_path)
+        if cache_file is not None and cache_file.exists():
+            try:
+                self._tools_cache = tuple(
+                    json.loads(cache_file.read_text(encoding="utf-8"))
+                )
+            except Exception:
+                self._tools_cache = None
+
+        if self._tools_cache is None:
+            tools_response = await asyncio.wait_for(
+                self.session.list_tools(), timeout=10.0
+            )
+            self._tools_cache = _freeze_tools(tools_response)
+            if cache_file is not None:
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    for stale in cache_file.parent.glob("tools-*.json"):
+                        if stale != cache_file:
+                            stale.unlink(missing_ok=True)
+                    cache_file.write_text(
+                        json.dumps(list(self._tools_cache)), encoding="utf-8"
+                    )
+                except OSError:
+                    pass  # Cache is best effort; the RPC result is in hand
 
     async def close(self):
         await self.exit_stack.aclose()
@@ -94,14 +166,7 @@ class DocsNavigatorClient:
                 tools_response = await asyncio.wait_for(
                     self.session.list_tools(), timeout=10.0
                 )
-                self._tools_cache = [
-                    {
-                        "name": t.name,
-                        "description": t.description,
-                        "input_schema": t.inputSchema,
-                    }
-                    for t in tools_response.tools
-                ]
+                self._tools_cache = _freeze_tools(tools_response)
             except asyncio.TimeoutError:
                 raise RuntimeError("Failed to get tools list from server - server may be unresponsive")
 
@@ -125,21 +190,36 @@ class DocsNavigatorClient:
         max_iterations = 10  # Prevent infinite loops
         iteration = 0
 
+        async def _create(max_tokens: int):
+            return await asyncio.wait_for(
+                asyncio.to_thread(
+                    self.anthropic.messages.create,
+                    model="claude-3-haiku-20240307",
+                    max_tokens=max_tokens,
+                    messages=messages,
+                    tools=tools,
+                ),
+                timeout=20.0
+            )
+
         while iteration < max_iterations:
             iteration += 1
-            
+
+            # The opening turn usually just picks tools, which takes far
+            # fewer than 2500 tokens; a small decode budget lowers time to
+            # first token. Turns after tool results get the full budget
+            # since they produce the narrative answer.
+            max_tokens = 512 if iteration == 1 else 2500
+
             try:
                 # Call the LLM with timeout
-                response = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self.anthropic.messages.create,
-                        model="claude-3-haiku-20240307",
-                        max_tokens=2500,
-                        messages=messages,
-                        tools=tools,
-                    ),
-                    timeout=20.0
-                )
+                response = await _create(max_tokens)
+                if max_tokens < 2500 and response.stop_reason == "max_tokens":
+                    # The planning budget cut the turn off — whether
+                    # mid-answer or mid-tool_use (whose truncated input
+                    # must never reach the server) — so redo it with the
+                    # full allowance.
+                    response = await _create(2500)
             except asyncio.TimeoutError:
                 return "⏰ The AI model took too long to respond. Please try a simpler question."
             except Exception as e:
@@ -160,38 +240,7 @@ class DocsNavigatorClient:
                 return "\n".join(text_content) if text_content else "[no text response from model]"
 
             # Execute all tool calls in this round
-            tool_results = []
-            for tool_call in tool_calls:
-                try:
-                    tool_name = tool_call.name
-                    tool_args = tool_call.input
-                    
-                    # Call the MCP tool with timeout
-                    result = await asyncio.wait_for(
-                        self.session.call_tool(tool_name, tool_args),
-                        timeout=15.0
-                    )
-                    
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_call.id,
-                        "content": result.content,
-                    })
-                except asyncio.TimeoutError:
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_call.id,
-                        "content": f"Tool {tool_call.name} timed out - server may be processing large files",
-                        "is_error": True,
-                    })
-                except Exception as e:
-                    # Handle tool errors gracefully
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_call.id,
-                        "content": f"Error calling tool {tool_call.name}: {str(e)}",
-                        "is_error": True,
-                    })
+            tool_results = await self._execute_tool_calls(tool_calls)
 
             # Add tool results to conversation
             messages.append({
@@ -211,52 +260,281 @@ class DocsNavigatorClient:
 
         return "\n".join(text_content) if text_content else "[reached max iterations without final response]"
 
+    async def answer_stream(self, user_query: str):
+        """
+        Streaming variant of answer(): yields text chunks as the model
+        produces them instead of waiting for each full response.
+        Runs the same multi-turn tool loop.
+        """
+        if not self.session:
+            raise RuntimeError("MCP session not initialized. Call connect() first.")
 
-# Thread-local storage for client instances
+        if self._tools_cache is None:
+            try:
+                tools_response = await asyncio.wait_for(
+                    self.session.list_tools(), timeout=10.0
+                )
+                self._tools_cache = _freeze_tools(tools_response)
+            except asyncio.TimeoutError:
+                raise RuntimeError("Failed to get tools list from server - server may be unresponsive")
+
+        messages = [
+            {
+                "role": "user",
+                "content": (
+                    "You are a documentation assistant with OCR (Optical Character Recognition) capabilities. "
+                    "Use the available MCP tools to search and read docs in order to answer questions. "
+                    "You can process both text documents AND image files (PNG, JPG, etc.) using OCR to extract text content. "
+                    "When users ask about images or visual content, use list_docs to find image files, "
+                    "then use read_doc to extract text from images via OCR. "
+                    "You can use multiple tools and think through your response step by step. "
+                    "Always reference the files you used and mention OCR confidence when available.\n\n"
+                    f"User question: {user_query}"
+                ),
+            }
+        ]
+
+        tools = self._tools_cache
+        max_iterations = 10  # Prevent infinite loops
+        iteration = 0
+        loop = asyncio.get_running_loop()
+
+        while iteration < max_iterations:
+            iteration += 1
+            queue: asyncio.Queue = asyncio.Queue()
+
+            def run_stream():
+                # The Anthropic client is synchronous, so the stream runs in a
+                # worker thread and hands chunks back to the event loop. The
+                # sentinel goes out in a finally so the consumer is never left
+                # waiting if the stream raises; the exception itself surfaces
+                # when the consumer awaits stream_task.
+                try:
+                    with self.anthropic.messages.stream(
+                        model="claude-3-haiku-20240307",
+                        max_tokens=2500,
+                        messages=messages,
+                        tools=tools,
+                    ) as stream:
+                        for event in stream:
+                            if event.type == "content_block_delta" and event.delta.type == "text_delta":
+                                loop.call_soon_threadsafe(queue.put_nowait, ("text", event.delta.text))
+                            elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                                loop.call_soon_threadsafe(queue.put_nowait, ("tool", event.content_block))
+                        return stream.get_final_message()
+                finally:
+                    loop.call_soon_threadsafe(queue.put_nowait, None)
+
+            stream_task = asyncio.ensure_future(asyncio.to_thread(run_stream))
+            pending_tool_tasks = []
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    kind, payload = item
+                    if kind == "text":
+                        yield payload
+                    else:
+                        # A tool_use block is complete as soon as its stop
+                        # event arrives, so the MCP call starts here and
+                        # overlaps with the rest of the model's generation.
+                        pending_tool_tasks.append(
+                            asyncio.ensure_future(self._execute_one_tool_call(payload))
+                        )
+                response = await stream_task
+            except Exception as e:
+                for task in pending_tool_tasks:
+                    task.cancel()
+                yield f"\n❌ Error calling AI model: {str(e)}"
+                return
+
+            # Add assistant's response to conversation
+            messages.append({
+                "role": "assistant",
+                "content": response.content,
+            })
+
+            # Check if there are any tool calls to execute
+            tool_calls = [content for content in response.content if content.type == "tool_use"]
+
+            if not tool_calls:
+                # No more tool calls - we're done
+                return
+
+            # Tool calls were dispatched mid-stream; collect their results,
+            # then continue streaming the follow-up
+            tool_results = [await task for task in pending_tool_tasks]
+            messages.append({
+                "role": "user",
+                "content": tool_results,
+            })
+
+    async def _execute_tool_calls(self, tool_calls) -> list:
+        """Run a round of MCP tool calls, collecting results (and errors) per call.
+
+        The calls in one round are independent stdio RPCs, so they run
+        concurrently: wall time for a round is the slowest call instead
+        of the sum of all of them.
+        """
+        return list(await asyncio.gather(
+            *(self._execute_one_tool_call(tool_call) for tool_call in tool_calls)
+        ))
+
+    async def _execute_one_tool_call(self, tool_call) -> dict:
+        """Run a single MCP tool call, mapping timeouts and errors to
+        is_error tool_result dicts."""
+        try:
+            result = await asyncio.wait_for(
+                self.session.call_tool(tool_call.name, tool_call.input),
+                timeout=15.0
+            )
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_call.id,
+                "content": result.content,
+            }
+        except asyncio.TimeoutError:
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_call.id,
+                "content": f"Tool {tool_call.name} timed out - server may be processing large files",
+                "is_error": True,
+            }
+        except Exception as e:
+            # Handle tool errors gracefully
+            return {
+                "type": "tool_result",
+                "tool_use_id": tool_call.id,
+                "content": f"Error calling tool {tool_call.name}: {str(e)}",
+                "is_error": True,
+            }
+
+
+# Persistent client shared across requests.
+# Connecting spawns the MCP server subprocess and performs the handshake +
+# list_tools, which dominates per-request latency if repeated. We keep one
+# long-lived client on a dedicated background event loop instead.
+import atexit
+import concurrent.futures
 import threading
-_thread_local = threading.local()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_client: Optional[DocsNavigatorClient] = None
+_client_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get (or start) the dedicated event loop thread for MCP work."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="docs-navigator-mcp-loop",
+                daemon=True,
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def _get_client() -> DocsNavigatorClient:
+    """
+    Get the shared client, connecting it on first use.
+    Uses lightweight server by default for faster startup.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            loop = _get_background_loop()
+            client = DocsNavigatorClient()
+            asyncio.run_coroutine_threadsafe(
+                client.connect("lightweight_server.py"), loop
+            ).result(timeout=45.0)
+            _client = client
+        return _client
+
+
+def _close_client():
+    """Shut down the shared client on interpreter exit."""
+    global _client
+    with _client_lock:
+        if _client is not None and _loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(_client.close(), _loop).result(timeout=10.0)
+            except Exception:
+                pass  # Best effort - the server subprocess dies with us anyway
+            _client = None
+
+
+atexit.register(_close_client)
 
 
 def answer_sync(user_query: str) -> str:
     """
     Synchronous wrapper so Gradio can call into our async flow easily.
-    Creates a new client for each request to avoid event loop conflicts.
+    Reuses a single persistent client/session instead of reconnecting per request.
     """
-    import concurrent.futures
-    
-    def run_in_new_loop():
-        # Create a new event loop in this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            # Set a timeout for the entire operation - longer for initial connection
-            return loop.run_until_complete(
-                asyncio.wait_for(_answer_async(user_query), timeout=60.0)  # Longer timeout
-            )
-        except asyncio.TimeoutError:
-            return "⏰ Request timed out after 60 seconds. The server may be loading OCR models. Please wait a moment and try again."
-        except Exception as e:
-            return f"❌ Error: {str(e)}. Please try again or check the server configuration."
-        finally:
-            loop.close()
-    
-    # Run in a separate thread to avoid conflicts with Gradio's event loop
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future = executor.submit(run_in_new_loop)
-        try:
-            return future.result(timeout=65.0)  # Slightly longer than the inner timeout
-        except concurrent.futures.TimeoutError:
-            return "⏰ Request timed out. The server may be loading OCR models. Please try restarting the application."
+    try:
+        client = _get_client()
+    except concurrent.futures.TimeoutError:
+        return "⏰ Timed out connecting to the docs server. It may be loading OCR models. Please wait a moment and try again."
+    except Exception as e:
+        return f"❌ Error connecting to the docs server: {str(e)}. Please check the server configuration."
 
+    loop = _get_background_loop()
+    future = asyncio.run_coroutine_threadsafe(
+        asyncio.wait_for(client.answer(user_query), timeout=60.0), loop
+    )
+    try:
+        return future.result(timeout=65.0)  # Slightly longer than the inner timeout
+    except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+        return "⏰ Request timed out after 60 seconds. The server may be processing large files. Please try again."
+    except Exception as e:
+        return f"❌ Error: {str(e)}. Please try again or check the server configuration."
 
-async def _answer_async(user_query: str) -> str:
+
+def answer_stream_sync(user_query: str):
     """
-    Create a fresh client for each request to avoid event loop issues.
-    Uses lightweight server for faster startup.
+    Synchronous generator wrapper over answer_stream so Gradio can show
+    partial output. Yields the accumulated reply text as chunks arrive.
     """
-    client = DocsNavigatorClient()
     try:
-        await client.connect("lightweight_server.py")
-        return await client.answer(user_query)
+        client = _get_client()
+    except concurrent.futures.TimeoutError:
+        yield "⏰ Timed out connecting to the docs server. It may be loading OCR models. Please wait a moment and try again."
+        return
+    except Exception as e:
+        yield f"❌ Error connecting to the docs server: {str(e)}. Please check the server configuration."
+        return
+
+    loop = _get_background_loop()
+    agen = client.answer_stream(user_query)
+    accumulated = ""
+    try:
+        while True:
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(
+                    agen.__anext__(), loop
+                ).result(timeout=60.0)
+            except StopAsyncIteration:
+                break
+            accumulated += chunk
+            yield accumulated
+    except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+        yield accumulated + "\n⏰ Request timed out. The server may be processing large files. Please try again."
+        return
+    except Exception as e:
+        yield accumulated + f"\n❌ Error: {str(e)}. Please try again or check the server configuration."
+        return
     finally:
-        await client.close()
\ No newline at end of file
+        try:
+            asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result(timeout=5.0)
+        except Exception:
+            pass  # Generator may already be exhausted
+
+    if not accumulated:
+        yield "[no text response from model]"
\ No newline at end of file
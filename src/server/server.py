@@ -1,5 +1,7 @@
 # server_docs.py
 from __future__ import annotations
+import mmap
+import re
 from pathlib import Path
 from typing import List, Dict, Any
 
@@ -58,6 +60,22 @@ mcp = FastMCP("DocsNavigator")
 DOCS_ROOT = Path(__file__).parent.parent.parent / "docs"
 doc_intel = DocumentIntelligence(DOCS_ROOT)
 
+# Resolved once: the containment check runs on every doc read
+_DOCS_ROOT_RESOLVED = DOCS_ROOT.resolve()
+
+
+def _escapes_docs_root(path: Path) -> bool:
+    """Check whether a resolved path lies outside the docs root.
+
+    relative_to compares the parts tuples in one pass instead of
+    building and linearly scanning the parents sequence per read.
+    """
+    try:
+        path.relative_to(_DOCS_ROOT_RESOLVED)
+    except ValueError:
+        return True
+    return False
+
 
 def _iter_docs() -> list[Path]:
     exts = {".md", ".txt", ".rst"}
@@ -68,11 +86,58 @@ def _iter_docs() -> list[Path]:
     if OCR_SUPPORT:
         image_exts = {".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".gif"}
         exts.update(image_exts)
-    
-    return [
-        p for p in DOCS_ROOT.rglob("*")
-        if p.is_file() and p.suffix.lower() in exts
-    ]
+
+    # scandir beats rglob here because it filters on raw dirent names
+    # without building a Path (or stat'ing) for every entry.
+    files: list[Path] = []
+    stack = [str(DOCS_ROOT)]
+    while stack:
+        dir_path = stack.pop()
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in exts:
+                        files.append(Path(entry.path))
+        except OSError:
+            continue
+
+    files.sort()
+    return files
+
+
+# Per-file text cache: (mtime, text, lowercased text, token set).
+# Search touches every doc per query, and re-reading (for PDFs,
+# re-OCRing) plus re-lowercasing multi-MB strings on each request is
+# pure per-query waste; the lowered twin and token set are stored so
+# queries never allocate a copy and presence checks are O(1).
+_doc_text_cache: dict[Path, tuple[float, str, str, frozenset[str]]] = {}
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _cached_doc_text(path: Path) -> tuple[str, str, frozenset[str]]:
+    """Return (text, lowered_text, tokens) for a doc, cached on file mtime."""
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        mtime = -1.0
+    entry = _doc_text_cache.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1], entry[2], entry[3]
+    text = _read_file(path)
+    lowered = text.lower()
+    tokens = frozenset(_TOKEN_RE.findall(lowered))
+    _doc_text_cache[path] = (mtime, text, lowered, tokens)
+    return text, lowered, tokens
+
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+|\n\n+')
+
+
+# Below this size the mmap setup costs more than it saves
+_MMAP_THRESHOLD = 64 * 1024
 
 
 def _read_file(path: Path) -> str:
@@ -83,7 +148,20 @@ def _read_file(path: Path) -> str:
     elif suffix in {".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".gif"}:
         return _read_image_file(path)
     else:
-        return path.read_text(encoding="utf-8", errors="ignore")
+        return _read_text_file(path)
+
+
+def _read_text_file(path: Path) -> str:
+    """Read a text doc, memory-mapping large files.
+
+    mmap lets the decode run straight off the page cache without an
+    intermediate bytes copy, which matters for big markdown exports.
+    """
+    with open(path, 'rb') as f:
+        if path.stat().st_size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:].decode("utf-8", errors="ignore")
+        return f.read().decode("utf-8", errors="ignore")
 
 
 def _read_image_file(path: Path) -> str:
@@ -489,7 +567,7 @@ def read_doc(relative_path: str) -> str:
     path = (DOCS_ROOT / relative_path).resolve()
     if not path.exists() or not path.is_file():
         return f"Document not found: {relative_path}"
-    if DOCS_ROOT not in path.parents and DOCS_ROOT != path.parent:
+    if _escapes_docs_root(path):
         return "Access denied: path escapes docs root."
     return _read_file(path)
 
@@ -513,21 +591,30 @@ def search_docs(query: str, max_results: int = 10) -> List[Dict[str, str]]:
     Returns:
         List of {path, snippet} matches.
     """
-    import re
-    
     query_lower = query.lower()
     query_words = query_lower.split()
     results: list[dict[str, str]] = []
 
     for path in _iter_docs():
-        text = _read_file(path)
-        text_lower = text.lower()
+        text, text_lower, tokens = _cached_doc_text(path)
+
+        # Index-backed prefilter: a sentence can only clear the 60%
+        # word threshold below if the document as a whole does, so skip
+        # the sentence scan entirely for docs that cannot match. Token
+        # membership is O(1); the find fallback keeps substring matches
+        # (e.g. "config" inside "configuration") working.
+        word_hits = sum(
+            1 for word in query_words if word in tokens or word in text_lower
+        )
+        has_phrase = query_lower in text_lower
+        if not has_phrase and word_hits < max(1, len(query_words) * 0.6):
+            continue
         
         # Score based on how many query words are found
         matches = []
         
         # First, try exact phrase match (highest score)
-        if query_lower in text_lower:
+        if has_phrase:
             idx = text_lower.find(query_lower)
             start = max(0, idx - 80)
             end = min(len(text), idx + 80)
@@ -539,7 +626,7 @@ def search_docs(query: str, max_results: int = 10) -> List[Dict[str, str]]:
             })
         
         # Then try to find sentences containing most query words
-        sentences = re.split(r'[.!?]+|\n\n+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         for sentence in sentences:
             sentence_lower = sentence.lower()
             word_matches = sum(1 for word in query_words if word in sentence_lower)
@@ -586,7 +673,7 @@ def extract_section(relative_path: str, section_title: str, include_subsections:
     path = (DOCS_ROOT / relative_path).resolve()
     if not path.exists() or not path.is_file():
         return {"error": f"Document not found: {relative_path}"}
-    if DOCS_ROOT not in path.parents and DOCS_ROOT != path.parent:
+    if _escapes_docs_root(path):
         return {"error": "Access denied: path escapes docs root."}
     
     content = _read_file(path)
@@ -671,7 +758,7 @@ def summarize_document(relative_path: str, summary_type: str = "overview") -> Di
     path = (DOCS_ROOT / relative_path).resolve()
     if not path.exists() or not path.is_file():
         return {"error": f"Document not found: {relative_path}"}
-    if DOCS_ROOT not in path.parents and DOCS_ROOT != path.parent:
+    if _escapes_docs_root(path):
         return {"error": "Access denied: path escapes docs root."}
     
     content = _read_file(path)
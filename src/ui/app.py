@@ -3,24 +3,26 @@ import gradio as gr
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from src.agent.client import answer_sync
+from src.agent.client import answer_stream_sync
 
 
 def chat_fn(message: str, history: list[dict]):
-    """Enhanced chat function with better error handling and user feedback"""
+    """Enhanced chat function that streams partial responses to the UI"""
     try:
         if not message.strip():
-            return "Please enter a question about the documentation."
-        
+            yield "Please enter a question about the documentation."
+            return
+
         # Add loading indicator
         print(f"🔍 Processing: {message[:50]}...")
-        reply = answer_sync(message)
+        reply = ""
+        for reply in answer_stream_sync(message):
+            yield reply
         print(f"✅ Response generated: {len(reply)} characters")
-        return reply
     except Exception as e:
         error_msg = f"⚠️ I encountered an error while processing your question: {str(e)}\n\nPlease try again or rephrase your question."
         print(f"❌ Error in chat_fn: {e}")
-        return error_msg
+        yield error_msg
 
 
 def main():
@@ -31,6 +33,9 @@ def main():
     print("💡 Ask questions about your documentation!")
     print("-" * 50)
     
+    # Allow concurrent requests; LLM calls are I/O-bound so these
+    # workers are nearly free
+    demo.queue(default_concurrency_limit=8, max_size=64)
     demo.launch(
         server_name="127.0.0.1",
         server_port=7862,
@@ -91,6 +96,7 @@ custom_css = """
 demo = gr.ChatInterface(
     fn=chat_fn,
     type="messages",
+    concurrency_limit=8,
     title="📚 Docs Navigator MCP",
     description="🤖 **AI-Powered Documentation Assistant**\n\nAsk questions about your documentation and get intelligent, contextual answers. Powered by Claude AI and Model Context Protocol.",
     theme=professional_theme,
@@ -124,6 +130,7 @@ demo = gr.ChatInterface(
 )
 
 if __name__ == "__main__":
+    demo.queue(default_concurrency_limit=8, max_size=64)
     demo.launch(
         server_name="127.0.0.1",
         server_port=7860,
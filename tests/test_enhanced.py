@@ -77,8 +77,9 @@ def test_gradio_interface():
         question = "Describe the aurora_diagram.png image"
         print(f"🔍 Testing question: {question}")
         
-        # Simulate the Gradio call
-        result = enhanced_chat_fn(question, [])
+        # Simulate the Gradio call; enhanced_chat_fn streams its reply,
+        # so collect the chunks into the full response text
+        result = "".join(enhanced_chat_fn(question, []))
         
         print("✅ Response received:")
         print("-" * 30)